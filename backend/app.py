@@ -5,6 +5,7 @@ from flask_cors import CORS
 
 from algorithms import top_k_routes_manual
 from db import get_conn
+from warmup import get_dimensions
 
 app = Flask(__name__)
 CORS(app)
@@ -71,15 +72,12 @@ def health():
 
 @app.get("/api/filter-options")
 def filter_options():
-    conn = get_conn()
-    boroughs = conn.execute("SELECT DISTINCT borough FROM dim_zone ORDER BY borough").fetchall()
-    date_row = conn.execute("SELECT MIN(pickup_date) min_date, MAX(pickup_date) max_date FROM dim_time").fetchone()
-    conn.close()
+    dims = get_dimensions()
     return jsonify(
         {
-            "boroughs": [x["borough"] for x in boroughs],
-            "min_date": date_row["min_date"],
-            "max_date": date_row["max_date"],
+            "boroughs": list(dims["boroughs"]),
+            "min_date": dims["min_date"],
+            "max_date": dims["max_date"],
             "payment_types": [
                 {"id": 1, "label": "Credit card"},
                 {"id": 2, "label": "Cash"},
@@ -234,22 +232,20 @@ def zones_heatmap():
             GROUP BY z.location_id""",
         params,
     ).fetchall()
-    geoms = conn.execute(
-        "SELECT location_id, wkt, min_x, min_y, max_x, max_y FROM zone_geometry"
-    ).fetchall()
     conn.close()
 
-    counts = {r["location_id"]: dict(r) for r in rows}
+    counts = {r["location_id"]: r["trip_count"] for r in rows}
+    dims = get_dimensions()
     payload = []
-    for g in geoms:
-        row = counts.get(g["location_id"])
+    for g in dims["geometry"]:
+        zone = dims["zones"].get(g["location_id"])
         payload.append(
             {
                 "location_id": g["location_id"],
-                "zone": row["zone"] if row else "Unknown",
-                "borough": row["borough"] if row else "Unknown",
-                "trip_count": row["trip_count"] if row else 0,
-                "bbox": [g["min_x"], g["min_y"], g["max_x"], g["max_y"]],
+                "zone": zone["zone"] if zone else "Unknown",
+                "borough": zone["borough"] if zone else "Unknown",
+                "trip_count": counts.get(g["location_id"], 0),
+                "bbox": list(g["bbox"]),
                 "wkt": g["wkt"],
             }
         )
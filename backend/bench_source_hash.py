@@ -0,0 +1,143 @@
+"""Benchmark legacy SHA-256 source_hash against the vectorized 64-bit fingerprint.
+
+Reports hashing throughput, measured load_trips throughput with each hasher
+and the size of the UNIQUE source_hash index, using a synthetic chunk so it
+runs without the TLC files.
+
+Usage: python backend/bench_source_hash.py [rows]
+"""
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import etl
+
+
+def synthetic_chunk(n, seed=0):
+    rng = np.random.default_rng(seed)
+    pickup = pd.Timestamp("2019-01-01") + pd.to_timedelta(rng.integers(0, 31 * 86400, n), unit="s")
+    duration = pd.to_timedelta(rng.integers(60, 3600, n), unit="s")
+    fare = rng.uniform(2.5, 80, n).round(2)
+    return pd.DataFrame(
+        {
+            "VendorID": rng.integers(1, 3, n),
+            "tpep_pickup_datetime": pickup.strftime("%Y-%m-%d %H:%M:%S"),
+            "tpep_dropoff_datetime": (pickup + duration).strftime("%Y-%m-%d %H:%M:%S"),
+            "passenger_count": rng.integers(1, 6, n),
+            "trip_distance": rng.uniform(0.5, 20, n).round(2),
+            "RatecodeID": 1,
+            "PULocationID": rng.integers(1, 264, n),
+            "DOLocationID": rng.integers(1, 264, n),
+            "payment_type": rng.integers(1, 5, n),
+            "fare_amount": fare,
+            "tip_amount": (fare * rng.uniform(0, 0.3, n)).round(2),
+            "total_amount": (fare * 1.2).round(2),
+        }
+    )
+
+
+def legacy_chunk_source_hash(df, pickup_col, dropoff_col, fmt=None):
+    """Per-row SHA-256 drop-in for etl.chunk_source_hash, as the ETL hashed before.
+
+    Walks plain column iterators rather than iterrows(), so only the hashing
+    cost is added to the load_trips pass the ETL still makes.
+    """
+    return pd.Series(
+        [
+            etl.hash_row([vendor, str(pickup), str(dropoff), pu, do, fare, dist])
+            for vendor, pickup, dropoff, pu, do, fare, dist in zip(
+                df["VendorID"],
+                df[pickup_col],
+                df[dropoff_col],
+                df["PULocationID"],
+                df["DOLocationID"],
+                df["fare_amount"],
+                df["trip_distance"],
+            )
+        ],
+        index=df.index,
+        dtype=object,
+    )
+
+
+def bench_hashing(clean):
+    start = time.perf_counter()
+    legacy_chunk_source_hash(clean, "tpep_pickup_datetime", "tpep_dropoff_datetime")
+    legacy = time.perf_counter() - start
+
+    start = time.perf_counter()
+    etl.chunk_source_hash(clean, "tpep_pickup_datetime", "tpep_dropoff_datetime")
+    vectorized = time.perf_counter() - start
+    return legacy, vectorized
+
+
+def bench_etl(chunk, db_path, hasher=None):
+    etl.DB_PATH = db_path
+    etl.build_db()
+    etl.load_zones()
+    original_iter = etl.iter_trip_chunks
+    original_hasher = etl.chunk_source_hash
+    etl.iter_trip_chunks = lambda: iter([chunk])
+    if hasher is not None:
+        etl.chunk_source_hash = hasher
+    try:
+        start = time.perf_counter()
+        etl.load_trips()
+        return time.perf_counter() - start
+    finally:
+        etl.iter_trip_chunks = original_iter
+        etl.chunk_source_hash = original_hasher
+
+
+def index_bytes(values, decl_type, db_path):
+    conn = sqlite3.connect(db_path)
+    conn.execute(f"CREATE TABLE h (source_hash {decl_type} NOT NULL UNIQUE)")
+    conn.executemany("INSERT INTO h VALUES (?)", ((v,) for v in values))
+    conn.commit()
+    try:
+        size = conn.execute(
+            "SELECT SUM(pgsize) FROM dbstat WHERE name = 'sqlite_autoindex_h_1'"
+        ).fetchone()[0]
+        scope = "index"
+    except sqlite3.OperationalError:
+        # dbstat not compiled in: only the whole file (table + index) can be measured.
+        size = conn.execute("PRAGMA page_count").fetchone()[0] * conn.execute("PRAGMA page_size").fetchone()[0]
+        scope = "db size"
+    conn.close()
+    return size, scope
+
+
+def main(n):
+    chunk = synthetic_chunk(n)
+    clean, _ = etl.clean_chunk(chunk)
+    legacy_s, vector_s = bench_hashing(clean)
+    print(f"rows: {len(clean)}")
+    print(f"hashing  legacy sha256: {legacy_s:.3f}s ({len(clean) / legacy_s:,.0f} rows/s)")
+    print(f"hashing  fingerprint:   {vector_s:.3f}s ({len(clean) / vector_s:,.0f} rows/s)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        legacy_etl_s = bench_etl(chunk, tmp / "bench_legacy.db", legacy_chunk_source_hash)
+        etl_s = bench_etl(chunk, tmp / "bench.db")
+        print(f"etl      legacy sha256: {legacy_etl_s:.3f}s ({len(clean) / legacy_etl_s:,.0f} rows/s)")
+        print(f"etl      fingerprint:   {etl_s:.3f}s ({len(clean) / etl_s:,.0f} rows/s)")
+
+        legacy_hex = legacy_chunk_source_hash(clean, "tpep_pickup_datetime", "tpep_dropoff_datetime")
+        fingerprints = etl.chunk_source_hash(clean, "tpep_pickup_datetime", "tpep_dropoff_datetime", fmt="int")
+        hex_fingerprints = etl.chunk_source_hash(clean, "tpep_pickup_datetime", "tpep_dropoff_datetime", fmt="hex")
+        for i, (label, values, decl) in enumerate((
+            ("legacy sha256 TEXT", legacy_hex, "TEXT"),
+            ("fingerprint INTEGER", fingerprints, "BLOB"),
+            ("fingerprint hex TEXT", hex_fingerprints, "BLOB"),
+        )):
+            size, scope = index_bytes(values, decl, tmp / f"index_{i}.db")
+            print(f"{scope:<8} {label:<21} {size / 1024:,.0f} KiB")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,126 @@
+"""Benchmark app startup time and first-request latency, cold vs warmed.
+
+Each case runs in a fresh interpreter with the DB evicted from the OS page
+cache. The interpreter optionally warms up, then forks, and the first
+requests are timed in the child, the way a gunicorn worker forked from a
+preloaded master sees them. Uses mobility.db when it exists, otherwise a
+temporary database loaded from a synthetic chunk. POSIX only (os.fork).
+
+Usage: python backend/bench_startup.py [rows]
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import etl
+
+BACKEND = Path(__file__).resolve().parent
+
+CASE = r"""
+import gc, json, os, sys, time
+start = time.perf_counter()
+import db
+db.DB_PATH = sys.argv[1]
+from app import app
+import_s = time.perf_counter() - start
+heavy = sorted(m for m in ("pandas", "numpy", "pyarrow", "shapefile") if m in sys.modules)
+
+warm_s = 0.0
+if sys.argv[2] == "warm":
+    from warmup import warm
+    start = time.perf_counter()
+    warm(app)
+    warm_s = time.perf_counter() - start
+gc.freeze()
+
+# Time the first requests in a forked child, like a gunicorn worker.
+read_fd, write_fd = os.pipe()
+pid = os.fork()
+if pid == 0:
+    os.close(read_fd)
+    client = app.test_client()
+    first = {}
+    for path in sys.argv[3:]:
+        start = time.perf_counter()
+        client.get(path)
+        first[path] = time.perf_counter() - start
+    os.write(write_fd, json.dumps(first).encode("utf-8"))
+    os._exit(0)
+os.close(write_fd)
+with os.fdopen(read_fd) as f:
+    first = json.loads(f.read())
+os.waitpid(pid, 0)
+print(json.dumps({"import_s": import_s, "warm_s": warm_s, "first": first, "heavy": heavy}))
+"""
+
+FIRST_REQUEST_PATHS = ("/api/filter-options", "/api/summary", "/api/zones/heatmap")
+
+
+def evict_page_cache(db_path):
+    """Drop the DB file from the OS page cache so each case starts from disk."""
+    if not hasattr(os, "posix_fadvise"):
+        return False
+    fd = os.open(db_path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    finally:
+        os.close(fd)
+    return True
+
+
+def run_case(db_path, mode):
+    evict_page_cache(db_path)
+    out = subprocess.run(
+        [sys.executable, "-c", CASE, str(db_path), mode, *FIRST_REQUEST_PATHS],
+        cwd=BACKEND,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def synthetic_db(db_path, n):
+    from bench_source_hash import synthetic_chunk
+
+    original_db, original_iter = etl.DB_PATH, etl.iter_trip_chunks
+    etl.DB_PATH = db_path
+    chunk = synthetic_chunk(n)
+    etl.iter_trip_chunks = lambda: iter([chunk])
+    try:
+        etl.build_db()
+        etl.load_zones()
+        etl.load_zone_geometry()
+        etl.load_trips()
+    finally:
+        etl.DB_PATH, etl.iter_trip_chunks = original_db, original_iter
+
+
+def report(db_path):
+    if not hasattr(os, "posix_fadvise"):
+        print("posix_fadvise unavailable: DB pages may already be cached for the cold case.")
+    for mode in ("cold", "warm"):
+        res = run_case(db_path, mode)
+        print(f"{mode:<5} import app: {res['import_s'] * 1000:7.1f} ms  warm-up: {res['warm_s'] * 1000:7.1f} ms")
+        for path, secs in res["first"].items():
+            print(f"      first {path:<22} {secs * 1000:7.1f} ms")
+        if res["heavy"]:
+            print(f"      heavy modules imported by app: {', '.join(res['heavy'])}")
+
+
+def main(n):
+    if etl.DB_PATH.exists():
+        report(etl.DB_PATH)
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "bench.db"
+        synthetic_db(db_path, n)
+        report(db_path)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
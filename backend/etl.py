@@ -1,4 +1,5 @@
 import hashlib
+import os
 import sqlite3
 from pathlib import Path
 
@@ -20,12 +21,63 @@ ZONE_SHP_FALLBACK = ROOT / "taxi_zones" / "taxi_zones.shp"
 
 CHUNK_SIZE = 200_000
 
+# "int" stores the 64-bit row fingerprint as a SQLite INTEGER (8 bytes);
+# "hex" stores the same fingerprint as 16-char hex TEXT for tools that expect text.
+SOURCE_HASH_FORMAT = os.environ.get("SOURCE_HASH_FORMAT", "int")
+SOURCE_HASH_FORMATS = ("int", "hex")
+
 
 def hash_row(values):
+    """Legacy per-row SHA-256 hex digest, kept for comparison benchmarks."""
     s = "|".join(str(v) for v in values)
     return hashlib.sha256(s.encode("utf-8")).hexdigest()
 
 
+def fingerprint_frame(vendor_id, pickup_datetime, duration_s, pu_location_id, do_location_id, fare_amount, trip_distance):
+    """Vectorized 64-bit fingerprint of whole chunk columns.
+
+    Inputs are normalized to fixed dtypes so the ETL and the migration, which
+    read the same values from different sources, hash identically.
+    """
+    frame = pd.DataFrame(
+        {
+            "vendor_id": pd.to_numeric(pd.Series(vendor_id), errors="coerce").fillna(-1).astype("int64").to_numpy(),
+            "pickup_datetime": pd.Series(pickup_datetime).astype(str).to_numpy(dtype=object),
+            "duration_s": pd.to_numeric(pd.Series(duration_s), errors="coerce").fillna(-1).round().astype("int64").to_numpy(),
+            "pu_location_id": pd.to_numeric(pd.Series(pu_location_id), errors="coerce").fillna(-1).astype("int64").to_numpy(),
+            "do_location_id": pd.to_numeric(pd.Series(do_location_id), errors="coerce").fillna(-1).astype("int64").to_numpy(),
+            "fare_amount": pd.to_numeric(pd.Series(fare_amount), errors="coerce").astype("float64").to_numpy(),
+            "trip_distance": pd.to_numeric(pd.Series(trip_distance), errors="coerce").astype("float64").to_numpy(),
+        }
+    )
+    return pd.util.hash_pandas_object(frame, index=False).to_numpy()
+
+
+def source_hash_values(fingerprints, fmt=None):
+    """Convert uint64 fingerprints into values sqlite3 can bind for `fmt`."""
+    fmt = fmt or SOURCE_HASH_FORMAT
+    if fmt not in SOURCE_HASH_FORMATS:
+        raise ValueError(f"Unknown SOURCE_HASH_FORMAT {fmt!r}; expected one of {SOURCE_HASH_FORMATS}")
+    if fmt == "hex":
+        return [f"{v:016x}" for v in fingerprints.tolist()]
+    # SQLite integers are signed 64-bit, so reinterpret the bits instead of overflowing.
+    return fingerprints.view("int64").tolist()
+
+
+def chunk_source_hash(df, pickup_col, dropoff_col, fmt=None):
+    duration_s = (df[dropoff_col] - df[pickup_col]).dt.total_seconds()
+    fingerprints = fingerprint_frame(
+        df["VendorID"],
+        df[pickup_col].dt.strftime("%Y-%m-%d %H:%M:%S"),
+        duration_s,
+        df["PULocationID"],
+        df["DOLocationID"],
+        df["fare_amount"],
+        df["trip_distance"],
+    )
+    return pd.Series(source_hash_values(fingerprints, fmt), index=df.index, dtype=object)
+
+
 def build_db():
     conn = sqlite3.connect(DB_PATH)
     with open(SCHEMA_SQL, "r", encoding="utf-8") as f:
@@ -184,19 +236,11 @@ def clean_chunk(df):
     for m, reason in rejects:
         part = df[m]
         if len(part) > 0:
-            for _, r in part.iterrows():
+            hashes = chunk_source_hash(part, "tpep_pickup_datetime", "tpep_dropoff_datetime")
+            for (_, r), source_hash in zip(part.iterrows(), hashes):
                 bad_rows.append(
                     {
-                        "source_hash": hash_row(
-                            [
-                                r.get("VendorID"),
-                                r.get("tpep_pickup_datetime"),
-                                r.get("tpep_dropoff_datetime"),
-                                r.get("PULocationID"),
-                                r.get("DOLocationID"),
-                                r.get("fare_amount"),
-                            ]
-                        ),
+                        "source_hash": source_hash,
                         "reject_reason": reason,
                         "raw_pickup_datetime": str(r.get("tpep_pickup_datetime")),
                         "raw_dropoff_datetime": str(r.get("tpep_dropoff_datetime")),
@@ -207,6 +251,7 @@ def clean_chunk(df):
 
     clean = df[valid].copy()
     clean["pickup_str"] = clean["tpep_pickup_datetime"].dt.strftime("%Y-%m-%d %H:%M:%S")
+    clean["source_hash"] = chunk_source_hash(clean, "tpep_pickup_datetime", "tpep_dropoff_datetime")
     return clean, bad_rows
 
 
@@ -255,17 +300,6 @@ def load_trips():
 
         for _, r in clean.iterrows():
             t_id = upsert_time(conn, r["pickup_str"])
-            source_hash = hash_row(
-                [
-                    r.get("VendorID"),
-                    r.get("pickup_str"),
-                    str(r.get("tpep_dropoff_datetime")),
-                    int(r.get("PULocationID")),
-                    int(r.get("DOLocationID")),
-                    float(r.get("fare_amount")),
-                    float(r.get("trip_distance")),
-                ]
-            )
 
             conn.execute(
                 """INSERT OR IGNORE INTO fact_trip
@@ -289,7 +323,7 @@ def load_trips():
                     float(r.get("avg_speed_mph")),
                     float(r.get("tip_pct")),
                     int(r.get("is_peak_hour")),
-                    source_hash,
+                    r["source_hash"],
                 ),
             )
 
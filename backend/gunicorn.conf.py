@@ -0,0 +1,26 @@
+"""Gunicorn settings: warm the app once in the master, then fork workers.
+
+Run from backend/: gunicorn -c gunicorn.conf.py app:app
+"""
+import gc
+import os
+import sqlite3
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+workers = int(os.environ.get("WEB_CONCURRENCY", 2))
+preload_app = True
+
+
+def when_ready(server):
+    from app import app
+    from warmup import warm
+
+    try:
+        warm(app)
+    except sqlite3.Error as ex:
+        # No DB yet (ETL not run): keep serving /api/health and let the
+        # dimensions load lazily once the data exists.
+        server.log.warning("Skipping warm-up: %s", ex)
+    # Move everything loaded so far out of GC tracking so workers don't dirty
+    # the shared pages when the collector touches object headers.
+    gc.freeze()
@@ -0,0 +1,143 @@
+"""Rewrite source_hash from legacy SHA-256 hex to the 64-bit fingerprint.
+
+fact_trip is rebuilt with fingerprints recomputed from its stored columns.
+reject_log only keeps raw strings, not the vendor/zone columns the
+fingerprint needs, so it is rebuilt with the new BLOB column and its legacy
+hashes set to NULL; rejects logged afterwards get fingerprints as usual.
+
+The rebuild runs in place inside one transaction and is rolled back if the
+fact_trip row count changes (e.g. two legacy rows share a fingerprint).
+Back up mobility.db first; the final VACUUM cannot be undone.
+
+Usage: python backend/migrate_source_hash.py [int|hex]
+"""
+import re
+import sqlite3
+import sys
+
+import pandas as pd
+
+from etl import DB_PATH, SCHEMA_SQL, SOURCE_HASH_FORMAT, fingerprint_frame, source_hash_values
+
+MIGRATE_CHUNK_SIZE = 200_000
+
+
+def _table_ddl(name):
+    with open(SCHEMA_SQL, "r", encoding="utf-8") as f:
+        schema = f.read()
+    table = re.search(rf"CREATE TABLE {name} \(.*?\n\);", schema, re.S).group(0)
+    indexes = re.findall(rf"CREATE INDEX \w+ ON {name}\([^)]*\);", schema)
+    return table, indexes
+
+
+def _is_legacy(conn, table):
+    cols = {r[1]: r[2] for r in conn.execute(f"PRAGMA table_info({table})")}
+    return cols.get("source_hash", "").upper() == "TEXT"
+
+
+def _rename_to_legacy(conn, table):
+    index_names = [r[0] for r in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL",
+        (table,),
+    )]
+    for name in index_names:
+        conn.execute(f"DROP INDEX {name}")
+    conn.execute(f"ALTER TABLE {table} RENAME TO {table}_legacy")
+    table_ddl, index_ddl = _table_ddl(table)
+    conn.execute(table_ddl)
+    return index_ddl
+
+
+def _migrate_fact_trip(conn, fmt):
+    index_ddl = _rename_to_legacy(conn, "fact_trip")
+
+    columns = [
+        r[1] for r in conn.execute("PRAGMA table_info(fact_trip_legacy)") if r[1] != "source_hash"
+    ]
+    col_sql = ", ".join(columns)
+    placeholders = ", ".join("?" for _ in range(len(columns) + 1))
+    select_sql = f"""SELECT {", ".join(f"f.{c}" for c in columns)}, t.pickup_datetime
+                     FROM fact_trip_legacy f
+                     JOIN dim_time t ON f.time_id = t.time_id
+                     ORDER BY f.trip_id"""
+
+    for chunk in pd.read_sql_query(select_sql, conn, chunksize=MIGRATE_CHUNK_SIZE):
+        fingerprints = fingerprint_frame(
+            chunk["vendor_id"],
+            chunk["pickup_datetime"],
+            chunk["duration_min"] * 60.0,
+            chunk["pu_location_id"],
+            chunk["do_location_id"],
+            chunk["fare_amount"],
+            chunk["trip_distance"],
+        )
+        rows = chunk[columns].astype(object).where(chunk[columns].notna(), None).values.tolist()
+        hashes = source_hash_values(fingerprints, fmt)
+        conn.executemany(
+            f"INSERT OR IGNORE INTO fact_trip ({col_sql}, source_hash) VALUES ({placeholders})",
+            [row + [h] for row, h in zip(rows, hashes)],
+        )
+
+    before = conn.execute("SELECT COUNT(*) FROM fact_trip_legacy").fetchone()[0]
+    after = conn.execute("SELECT COUNT(*) FROM fact_trip").fetchone()[0]
+    print(f"fact_trip rows: {before} before, {after} after.")
+    if before != after:
+        raise RuntimeError(
+            f"fact_trip lost {before - after} rows to fingerprint collisions or a missing dim_time join; rolled back."
+        )
+
+    conn.execute("DROP TABLE fact_trip_legacy")
+    for stmt in index_ddl:
+        conn.execute(stmt)
+    return after
+
+
+def _migrate_reject_log(conn):
+    index_ddl = _rename_to_legacy(conn, "reject_log")
+    columns = [
+        r[1] for r in conn.execute("PRAGMA table_info(reject_log_legacy)") if r[1] != "source_hash"
+    ]
+    col_sql = ", ".join(columns)
+    conn.execute(f"INSERT INTO reject_log ({col_sql}) SELECT {col_sql} FROM reject_log_legacy")
+
+    before = conn.execute("SELECT COUNT(*) FROM reject_log_legacy").fetchone()[0]
+    after = conn.execute("SELECT COUNT(*) FROM reject_log").fetchone()[0]
+    print(f"reject_log rows: {before} before, {after} after (legacy source_hash cleared).")
+    if before != after:
+        raise RuntimeError(f"reject_log row count changed ({before} -> {after}); rolled back.")
+
+    conn.execute("DROP TABLE reject_log_legacy")
+    for stmt in index_ddl:
+        conn.execute(stmt)
+
+
+def migrate(db_path=DB_PATH, fmt=None):
+    fmt = fmt or SOURCE_HASH_FORMAT
+    conn = sqlite3.connect(db_path)
+    legacy_fact = _is_legacy(conn, "fact_trip")
+    legacy_reject = _is_legacy(conn, "reject_log")
+    if not legacy_fact and not legacy_reject:
+        conn.close()
+        print("source_hash already migrated.")
+        return 0
+
+    migrated = 0
+    conn.execute("BEGIN")
+    try:
+        if legacy_fact:
+            migrated = _migrate_fact_trip(conn, fmt)
+        if legacy_reject:
+            _migrate_reject_log(conn)
+    except Exception:
+        conn.rollback()
+        conn.close()
+        raise
+    conn.commit()
+    conn.execute("VACUUM")
+    conn.close()
+    print(f"Migrated {migrated} fact_trip rows to {fmt} source_hash.")
+    return migrated
+
+
+if __name__ == "__main__":
+    migrate(fmt=sys.argv[1] if len(sys.argv) > 1 else None)
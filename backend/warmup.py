@@ -0,0 +1,79 @@
+"""Startup warm-up shared by gunicorn workers.
+
+Dimension tables are small and only change when the ETL is re-run, so they are
+loaded once into immutable structures. Under gunicorn with ``preload_app``
+this happens in the master before fork, and workers share the pages
+copy-on-write instead of each querying SQLite on their first request.
+
+The snapshot is taken once per process: /api/filter-options (boroughs and
+date range) and the zone names and geometry in /api/zones/heatmap keep
+serving it until the server is restarted, so restart after re-running the ETL.
+"""
+import os
+from types import MappingProxyType
+
+from db import get_conn
+
+WARMUP_PATHS = (
+    "/api/filter-options",
+    "/api/summary",
+    "/api/hourly-trips",
+    "/api/top-zones?k=10",
+    "/api/top-routes?k=10",
+    "/api/trips?limit=50",
+    "/api/zones/heatmap?metric=pickups",
+    "/api/insights",
+)
+
+_dimensions = None
+
+
+def load_dimensions():
+    conn = get_conn()
+    zones = conn.execute(
+        "SELECT location_id, borough, zone, service_zone FROM dim_zone ORDER BY location_id"
+    ).fetchall()
+    geoms = conn.execute(
+        "SELECT location_id, wkt, min_x, min_y, max_x, max_y FROM zone_geometry ORDER BY location_id"
+    ).fetchall()
+    date_row = conn.execute("SELECT MIN(pickup_date) min_date, MAX(pickup_date) max_date FROM dim_time").fetchone()
+    conn.close()
+
+    return MappingProxyType(
+        {
+            "zones": MappingProxyType({z["location_id"]: MappingProxyType(dict(z)) for z in zones}),
+            "boroughs": tuple(sorted({z["borough"] for z in zones})),
+            "geometry": tuple(
+                MappingProxyType(
+                    {
+                        "location_id": g["location_id"],
+                        "wkt": g["wkt"],
+                        "bbox": (g["min_x"], g["min_y"], g["max_x"], g["max_y"]),
+                    }
+                )
+                for g in geoms
+            ),
+            "min_date": date_row["min_date"],
+            "max_date": date_row["max_date"],
+        }
+    )
+
+
+def get_dimensions():
+    global _dimensions
+    if _dimensions is None:
+        _dimensions = load_dimensions()
+    return _dimensions
+
+
+def warm_queries(app, paths=WARMUP_PATHS):
+    """Run the dashboard's default requests once to pull fact_trip pages into the OS cache."""
+    client = app.test_client()
+    for path in paths:
+        client.get(path)
+
+
+def warm(app):
+    get_dimensions()
+    if os.environ.get("WARMUP_QUERIES", "1") != "0":
+        warm_queries(app)
@@ -51,7 +51,8 @@ CREATE TABLE fact_trip (
   avg_speed_mph REAL NOT NULL,
   tip_pct REAL NOT NULL,
   is_peak_hour INTEGER NOT NULL,
-  source_hash TEXT NOT NULL UNIQUE,
+  -- BLOB affinity keeps the 64-bit INTEGER fingerprint (or its hex TEXT form) unconverted.
+  source_hash BLOB NOT NULL UNIQUE,
   FOREIGN KEY(time_id) REFERENCES dim_time(time_id),
   FOREIGN KEY(pu_location_id) REFERENCES dim_zone(location_id),
   FOREIGN KEY(do_location_id) REFERENCES dim_zone(location_id),
@@ -62,7 +63,7 @@ CREATE TABLE fact_trip (
 
 CREATE TABLE reject_log (
   reject_id INTEGER PRIMARY KEY AUTOINCREMENT,
-  source_hash TEXT,
+  source_hash BLOB,
   reject_reason TEXT NOT NULL,
   raw_pickup_datetime TEXT,
   raw_dropoff_datetime TEXT,